@@ -2,7 +2,8 @@
 Putting together all the calculations that might be useful in futuire references
 '''
 import math
-from scipy.stats import norm
+import numpy as np
+from scipy.special import ndtr
 
 
 
@@ -15,7 +16,26 @@ Assumptions:
 def get_black_scholes_call_price(r,S,K,T,vol):
     d1 = (math.log(S/K) + (r+vol**2/2)*T)/(vol*T**(1/2))
     d2 = d1 - vol*T**(1/2)
-    return S*norm.cdf(d1,0,1) - K * math.exp(-r*T)*norm.cdf(d2,0,1)
+    # both terms can underflow to subnormals deep out of the money; a call is never worth < 0
+    return max(0.0, S*std_normal_cdf(d1) - K * math.exp(-r*T)*std_normal_cdf(d2))
+
+'''
+Standard normal CDF via math.erfc, avoids scipy.stats distribution dispatch on scalars.
+erfc keeps full precision in the lower tail, where 1 + erf(x) would cancel
+'''
+def std_normal_cdf(x):
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+'''
+Vectorized version of get_black_scholes_call_price: accepts arrays (or scalars)
+for any argument and prices every strike/maturity combination in one call
+'''
+def get_black_scholes_call_prices(r,S,K,T,vol):
+    r, S, K, T, vol = (np.asarray(x, dtype=np.float64) for x in (r, S, K, T, vol))
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S/K) + (r+vol**2/2)*T)/(vol*sqrt_T)
+    d2 = d1 - vol*sqrt_T
+    return S*ndtr(d1) - K * np.exp(-r*T)*ndtr(d2)
 
 def test_get_black_scholes_call_price():
     current_price = 100
@@ -1,6 +1,9 @@
 import backtrader as bt
 import datetime
+from array import array
+import numpy as np
 import plotly
+import talib
 from backtrader_plotting import Bokeh
 
 class cryptoCerbro(bt.Cerebro):
@@ -32,16 +35,104 @@ class cryptoCerbro(bt.Cerebro):
         return figs
 
 
+class PrecomputedRSI(bt.Indicator):
+    '''
+    Plots an RSI series computed up front by get_rsi() as a regular backtrader line,
+    copying values instead of recomputing them bar by bar
+    '''
+    lines = ('rsi',)
+    params = (('values', None), ('period', 14), ('low', 30), ('high', 70))
+    plotinfo = dict(plotname='RSI')
+
+    def __init__(self):
+        # same warm-up as bt.talib.RSI
+        self.addminperiod(self.p.period + 1)
+        self.plotinfo.plothlines = [self.p.low, self.p.high]
+
+    def _plotlabel(self):
+        # label like bt.talib.RSI instead of dumping the values array into the legend
+        return [self.p.period]
+
+    def next(self):
+        self.lines.rsi[0] = self.p.values[len(self) - 1]
+
+    def once(self, start, end):
+        # one slice assignment into the line's array('d') buffer
+        self.lines.rsi.array[start:end] = array('d', self.p.values[start:end].tobytes())
+
+
 class RSIStrategy(bt.Strategy):
+    params = (('period', 14), ('low', 30), ('high', 70))
+
     def __init__(self):
-        self.rsi = bt.talib.RSI(self.data, period=14)
+        close = self.data.close.array
+        if not len(close):
+            # feed not preloaded (preload=False, live data): nothing to precompute from
+            self.rsi = bt.talib.RSI(self.data, period=self.p.period)
+            self.entries = self.exits = None
+            return
+
+        # cerebro preloads the feed before building strategies, so the full close series is
+        # already here: compute every signal up front (np.array copies, leaving the line buffer resizable)
+        rsi = get_rsi(np.array(close, dtype=np.float64), self.p.period)
+        self.rsi = PrecomputedRSI(self.data, values=rsi, period=self.p.period, low=self.p.low, high=self.p.high)
+        # plain lists: indexing them per bar is cheaper than creating numpy scalars
+        self.entries, self.exits = (rsi < self.p.low).tolist(), (rsi > self.p.high).tolist()
 
     def next(self):
-        if self.rsi < 30 and not self.position:
+        if self.entries is None:
+            buy, sell = self.rsi[0] < self.p.low, self.rsi[0] > self.p.high
+        else:
+            i = len(self.data) - 1
+            buy, sell = self.entries[i], self.exits[i]
+
+        # position is a property lookup on the broker, read it once per bar
+        if self.position:
+            if sell:
+                self.close()
+        elif buy:
             self.buy(size=1)
 
-        if self.rsi > 70 and self.position:
-            self.close()
+
+def get_rsi(close, period=14):
+    '''
+    RSI of `close` over the whole series in a single TA-Lib call
+    '''
+    return talib.RSI(np.asarray(close, dtype=np.float64), timeperiod=period)
+
+
+def rsi_signals(close, period=14, low=30, high=70):
+    '''
+    Entry/exit masks for the RSI strategy computed over the whole close array
+    in one TA-Lib call instead of bar by bar inside cerebro
+    '''
+    rsi = get_rsi(close, period)
+    return rsi < low, rsi > high
+
+
+def run_rsi_vectorized(close, period=14, low=30, high=70, size=1, cash=10000.0):
+    '''
+    Vectorized equivalent of RSIStrategy: long `size` units from the close of the bar
+    RSI drops below `low` until the close of the bar it rises above `high`
+    (signal-bar close fills, as in vectorbt's from_signals).
+    Returns the equity curve as a numpy array, one value per bar.
+    '''
+    close = np.asarray(close, dtype=np.float64)
+    entries, exits = rsi_signals(close, period, low, high)
+
+    # forward fill the last entry/exit event to get the position held on each bar
+    n = len(close)
+    signal = np.full(n, -1, dtype=np.int8)
+    signal[exits] = 0
+    signal[entries] = 1
+    last_event = np.where(signal >= 0, np.arange(n), 0)
+    np.maximum.accumulate(last_event, out=last_event)
+    position = (signal[last_event] > 0).astype(np.float64)
+
+    # filled at the signal bar's close, so the position decided on bar i earns bar i+1's move
+    pnl = np.zeros(n)
+    pnl[1:] = position[:-1] * np.diff(close) * size
+    return cash + np.cumsum(pnl)
 
 
 def get_backtest_results():
@@ -2,7 +2,8 @@ from binance.client import Client
 from config import config
 from binance import ThreadedWebsocketManager
 from binance.enums import *
-import time, sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue, time, sys
 
 SYMBOL = "XRPAUD"
 POSITION_SIZE = 10
@@ -11,114 +12,146 @@ POSITION_SIZE = 10
 NUM_BUY_GRID_LINES = 3
 NUM_SELL_GRID_LINES = 3
 GRID_SIZE_PRCNT = 0.002
+# upper bound on grid orders submitted at once, keeps large grids inside Binance's order rate limit
+MAX_CONCURRENT_ORDERS = 5
 
-CHECK_ORDERS_FREQUENCY = 10
 ALIVE_ORDER_STATUS = ['NEW','PARTIALLY_FILLED']
 FILLED_ORDER_STATUS = 'FILLED'
 
+# seconds between REST re-checks of order state, in case the user data stream missed a fill
+RECONCILE_FREQUENCY = 60
+
 client = Client(config.API_KEY, config.API_SECRET)
 
 def grid_bot():
 
-    buy_orders = []
-    sell_orders = []
-
-
-
-    for i in range(NUM_BUY_GRID_LINES):
-        bid = float(get_l1_orderbook('bid'))
-        price =  round(bid - (bid * GRID_SIZE_PRCNT *(i+1)),4)
-        print("submitting market limit buy order at {}".format(price))
-        order = client.create_test_order(
-                symbol=SYMBOL,
-                side=SIDE_BUY,
-                type=ORDER_TYPE_LIMIT,
-                timeInForce=TIME_IN_FORCE_GTC,
-                quantity=POSITION_SIZE,
-                price=price)
-        order = client.order_limit_buy(symbol=SYMBOL, quantity=POSITION_SIZE, price=price)
-        buy_orders.append(order)
-
-    for j in range(NUM_SELL_GRID_LINES):
-
-        ask = float(get_l1_orderbook('ask')) #iki may be use bid
-        price = round(ask + (ask * GRID_SIZE_PRCNT * (j+1)), 4)
-        print("submitting market limit sell order at {}".format(price))
-        order = client.create_test_order(
-                symbol=SYMBOL,
-                side=SIDE_SELL,
-                type=ORDER_TYPE_LIMIT,
-                timeInForce=TIME_IN_FORCE_GTC,
-                quantity=POSITION_SIZE,
-                price=price)
-        order = client.order_limit_sell(symbol=SYMBOL, quantity=POSITION_SIZE, price=price)
-        sell_orders.append(order)
-
-
-    while True:
-        closed_order_ids = []
-
-        for buy_order in buy_orders:
-            print("checking buy order {}".format(buy_order['orderId']))
+    buy_orders = {}
+    sell_orders = {}
+
+    # the websocket thread only queues events; orders are placed and tracked on this thread,
+    # so a failing REST call can't kill the listener or stall the socket's event loop
+    events = queue.Queue()
+    twm = ThreadedWebsocketManager(api_key=config.API_KEY, api_secret=config.API_SECRET)
+    twm.start()
+    # start listening before placing the grid; fills that land before the socket has
+    # connected (or while it reconnects) are picked up by reconcile_orders()
+    twm.start_user_socket(callback=events.put)
+
+    try:
+        bid = get_l1_orderbook('bid')
+        ask = get_l1_orderbook('ask') #iki may be use bid
+        buy_prices = [round(bid - (bid * GRID_SIZE_PRCNT * (i+1)), 4) for i in range(NUM_BUY_GRID_LINES)]
+        sell_prices = [round(ask + (ask * GRID_SIZE_PRCNT * (j+1)), 4) for j in range(NUM_SELL_GRID_LINES)]
+
+        # submit the whole ladder at once rather than waiting a round trip per grid line
+        ladder = [(SIDE_BUY, price) for price in buy_prices] + [(SIDE_SELL, price) for price in sell_prices]
+        placement_errors = []
+        if ladder:
+            with ThreadPoolExecutor(max_workers=min(len(ladder), MAX_CONCURRENT_ORDERS)) as executor:
+                futures = {executor.submit(place_grid_order, side, price): side for side, price in ladder}
+                # track every order that did go through, even if another one failed
+                for future in as_completed(futures):
+                    try:
+                        order = future.result()
+                    except Exception as e:
+                        placement_errors.append(e)
+                        continue
+                    if futures[future] == SIDE_BUY:
+                        buy_orders[order['orderId']] = order
+                    else:
+                        sell_orders[order['orderId']] = order
+
+        if placement_errors:
+            print("grid placement failed, orders left open: {}".format(list(buy_orders) + list(sell_orders)))
+            raise placement_errors[0]
+
+        last_reconcile = time.monotonic()
+        while len(sell_orders) > 0:
             try:
-                order = client.get_order(symbol=SYMBOL, orderId=buy_order['orderId'])
-            except Exception as e:
-                print("request failed, retrying")
-                continue
-
-            #order_info = order['info']
-
-            if order['status']  in FILLED_ORDER_STATUS:
-                closed_order_ids.append(order['orderId'])
-                print("buy order executed at {}".format(order['price']))
-                new_sell_price = round(float(order['price']) + (float(order['price']) * GRID_SIZE_PRCNT), 4)
-                print("creating new limit sell order at {}".format(new_sell_price))
-                new_sell_order = client.order_limit_sell(symbol=SYMBOL, quantity=POSITION_SIZE, price=new_sell_price)
-                sell_orders.append(new_sell_order)
+                msg = events.get(timeout=max(0, last_reconcile + RECONCILE_FREQUENCY - time.monotonic()))
+            except queue.Empty:
+                msg = None
 
-            time.sleep(CHECK_ORDERS_FREQUENCY)
-
-        for sell_order in sell_orders:
-            print("checking sell order {}".format(sell_order['orderId']))
-            try:
-                order = client.get_order(symbol=SYMBOL, orderId=sell_order['orderId'])
-            except Exception as e:
-                print("request failed, retrying")
+            if msg is not None and msg.get('e') != 'error':
+                if msg.get('e') == 'executionReport' and msg['s'] == SYMBOL:
+                    handle_order_update(buy_orders, sell_orders, msg['i'], msg['X'], msg['p'])
                 continue
 
-            #order_info = order['info']
-
-            if order['status'] in FILLED_ORDER_STATUS:
-                closed_order_ids.append(order['orderId'])
-                print("sell order executed at {}".format(order['price']))
-                new_buy_price = round(float(order['price']) - (float(order['price']) * GRID_SIZE_PRCNT), 4)
-                print("creating new limit buy order at {}".format(new_buy_price))
-                print(get_binance_positions())
-                new_buy_order = client.order_limit_sell(symbol=SYMBOL, quantity=POSITION_SIZE, price=new_buy_price)
-                buy_orders.append(new_buy_order)
-
-            time.sleep(CHECK_ORDERS_FREQUENCY)
-
-        for order_id in closed_order_ids:
-            buy_orders = [buy_order for buy_order in buy_orders if buy_order['orderId'] != order_id]
-            sell_orders = [sell_order for sell_order in sell_orders if sell_order['orderId'] != order_id]
+            # periodic check, or the stream reported an error (disconnect/reconnect)
+            if msg is not None:
+                print("user data stream error: {}".format(msg))
+            reconcile_orders(buy_orders, sell_orders)
+            last_reconcile = time.monotonic()
+    finally:
+        twm.stop()
+
+    sys.exit("stopping bot, nothing left to sell")
+
+def handle_order_update(buy_orders, sell_orders, order_id, status, price):
+    if status in ALIVE_ORDER_STATUS:
+        return
+
+    if order_id in buy_orders:
+        del buy_orders[order_id]
+        if status == FILLED_ORDER_STATUS:
+            print("buy order executed at {}".format(price))
+            new_sell_price = round(float(price) + (float(price) * GRID_SIZE_PRCNT), 4)
+            print("creating new limit sell order at {}".format(new_sell_price))
+            new_sell_order = client.order_limit_sell(symbol=SYMBOL, quantity=POSITION_SIZE, price=new_sell_price)
+            sell_orders[new_sell_order['orderId']] = new_sell_order
+
+    elif order_id in sell_orders:
+        del sell_orders[order_id]
+        if status == FILLED_ORDER_STATUS:
+            print("sell order executed at {}".format(price))
+            new_buy_price = round(float(price) - (float(price) * GRID_SIZE_PRCNT), 4)
+            print("creating new limit buy order at {}".format(new_buy_price))
+            print(get_binance_positions())
+            new_buy_order = client.order_limit_buy(symbol=SYMBOL, quantity=POSITION_SIZE, price=new_buy_price)
+            buy_orders[new_buy_order['orderId']] = new_buy_order
+
+def reconcile_orders(buy_orders, sell_orders):
+    # catch up on anything the stream missed: one request for every resting order,
+    # then a get_order only for tracked orders that have left the book
+    try:
+        open_order_ids = {order['orderId'] for order in client.get_open_orders(symbol=SYMBOL)}
+    except Exception as e:
+        print("request failed, retrying")
+        return
+    closed_order_ids = [order_id for order_id in list(buy_orders) + list(sell_orders) if order_id not in open_order_ids]
+
+    for order_id in closed_order_ids:
+        print("checking order {}".format(order_id))
+        try:
+            order = client.get_order(symbol=SYMBOL, orderId=order_id)
+        except Exception as e:
+            print("request failed, retrying")
+            continue
+        handle_order_update(buy_orders, sell_orders, order_id, order['status'], order['price'])
+
+def place_grid_order(side, price):
+    if side == SIDE_BUY:
+        print("submitting market limit buy order at {}".format(price))
+        return client.order_limit_buy(symbol=SYMBOL, quantity=POSITION_SIZE, price=price)
+    else:
+        print("submitting market limit sell order at {}".format(price))
+        return client.order_limit_sell(symbol=SYMBOL, quantity=POSITION_SIZE, price=price)
 
-        if len(sell_orders) == 0:
-            sys.exit("stopping bot, nothing left to sell")
 
 def get_l1_orderbook(type):
-    order = client.get_order_book(symbol=SYMBOL)
+    # top of book only, much smaller than the full depth snapshot from get_order_book
+    ticker = client.get_orderbook_ticker(symbol=SYMBOL)
 
     if type == 'bid':
-        print("Latest bid: {}".format(order['bids'][0][0]))
-        return order['bids'][0][0]
+        price = float(ticker['bidPrice'])
+        print("Latest bid: {}".format(price))
     else:
-        print("Latest ask: {}".format(order['asks'][0][0]))
-        return order['asks'][0][0]
+        price = float(ticker['askPrice'])
+        print("Latest ask: {}".format(price))
+    return price
 
 
 def get_binance_positions():
-    client = Client(config.API_KEY, config.API_SECRET)
     account = client.get_account()
     balances = []
     balances_all = account['balances']
@@ -131,7 +164,8 @@ def get_binance_positions():
     return balances
 
 
-grid_bot()
+if __name__ == '__main__':
+    grid_bot()
 
 """
 if ran out of Symbols to sell, buy at best bid at the moment  = position * grid size to be back in the game -- Very risky
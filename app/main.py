@@ -1,5 +1,4 @@
 from fastapi import FastAPI
-import RSI_strategy
 
 app = FastAPI()
 
@@ -13,4 +12,6 @@ async def backtest(strategy: str):
 
 @app.get("/RSIbacktest")
 def RSIbacktest():
+    # imported here so backtrader/talib/plotly loading doesn't delay uvicorn startup
+    import RSI_strategy
     return RSI_strategy.get_backtest_results()
\ No newline at end of file